@@ -9,10 +9,17 @@ import grp
 import pwd
 import time
 import json
+import queue
+import re
+import collections
+import mmap
 import threading
-import serial
-import serial.tools.list_ports
-import psutil
+import concurrent.futures
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 try:
@@ -43,7 +50,7 @@ except Exception as e:
 
 # Constants
 
-AVAILABLE_SIMPLE_ACTIONS = [
+AVAILABLE_SIMPLE_ACTIONS = (
     "nothing",
     "volume_up", "volume_down", "mute", "play_pause", "next_track", "prev_track",
     "scroll_up", "scroll_down", "undo", "redo",
@@ -51,7 +58,7 @@ AVAILABLE_SIMPLE_ACTIONS = [
     "mouse_scroll_v_pos", "mouse_scroll_v_neg", "mouse_scroll_h_pos", "mouse_scroll_h_neg",
     "mouse_click_left", "mouse_click_right", "mouse_click_middle",
     "next_profile", "switch_profile_1", "switch_profile_2", "switch_profile_3",
-]
+)
 
 MODIFIER_DISPLAY_MAP = {
     "LEFT_CONTROL":  "Ctrl",    "LEFT_SHIFT":  "Shift",
@@ -65,88 +72,303 @@ _ALL_GESTURE_KEYS = (
     "long_press", "cw_shifted", "ccw_shifted",
 )
 
+# (label, gesture key, separated from the row above)
+_PROFILE_ROWS = (
+    ("Clockwise (CW):",   "cw",           False),
+    ("Counter-CW (CCW):", "ccw",          False),
+    ("Click:",            "click",        False),
+    ("Double Click:",     "double_click", False),
+    ("Triple Click:",     "triple_click", False),
+    ("Long Press:",       "long_press",   False),
+    ("Hold + CW:",        "cw_shifted",   True),
+    ("Hold + CCW:",       "ccw_shifted",  True),
+)
+
+# Slider readouts, indexed by the (integer) slider value.
+_SENS_LABELS = tuple(f"{n}x" for n in range(11))
+
+# Written into profiles.json / configurator_settings.json so the loader can skip
+# the structural v1–v3 detection for current files.
+CONFIG_VERSION = 4
+
+# Shared by reference: profile dicts replace action objects, never mutate them.
+DEFAULT_ACTION_OBJECT    = {"type": "simple", "action": "nothing"}
+DEFAULT_PROFILE_TEMPLATE = {k: DEFAULT_ACTION_OBJECT for k in _ALL_GESTURE_KEYS}
+
+_KEY_NORMALIZE = {
+    "CONTROL": "LEFT_CONTROL", "CTRL":    "LEFT_CONTROL",
+    "SHIFT":   "LEFT_SHIFT",
+    "ALT":     "LEFT_ALT",     "ALT_GR":  "LEFT_ALT",
+    "WIN":     "LEFT_GUI",     "CMD":     "LEFT_GUI",
+    "WINDOWS": "LEFT_GUI",     "COMMAND": "LEFT_GUI",
+    "WIN/CMD": "LEFT_GUI",     "WIN/COMMAND": "LEFT_GUI",
+    "DEL":     "DELETE",       "ESC":     "ESCAPE",
+    "UP":      "UP_ARROW",     "DOWN":    "DOWN_ARROW",
+    "LEFT":    "LEFT_ARROW",   "RIGHT":   "RIGHT_ARROW",
+}
+
 
 # Helpers
 
+def _json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomic(path, data):
+    # Write next to the target and swap it in, so an unplug mid-write leaves
+    # either the old file or the new one — never a truncated JSON.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable before the board is rebooted. Best
+        # effort: the file is already in place, and some mounts (e.g. vfat)
+        # refuse to open or fsync a directory.
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+_CURRENT_PROFILE_RE = re.compile(rb'"current_profile"\s*:\s*(\d+)')
+
+
+def read_current_profile(json_path, default=1):
+    # Only current_profile is needed, so search the mapped file for it instead
+    # of building the three profile dicts. It sits near the top of files we
+    # write, so the search usually stops within the first page.
+    try:
+        with open(json_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            m = _CURRENT_PROFILE_RE.search(data)
+            return int(m.group(1)) if m else default
+    except Exception:
+        return default
+
+
+_key_combo_text_cache = {}
+
+
+def format_key_combo(keys):
+    keys = tuple(keys)
+    text = _key_combo_text_cache.get(keys)
+    if text is None:
+        text = " + ".join(MODIFIER_DISPLAY_MAP.get(k, k.upper()) for k in keys)
+        _key_combo_text_cache[keys] = text
+    return text
+
+
 def normalize_key_name(key_str):
     key = key_str.strip().upper()
-    aliases = {
-        "CONTROL": "LEFT_CONTROL", "CTRL":    "LEFT_CONTROL",
-        "SHIFT":   "LEFT_SHIFT",
-        "ALT":     "LEFT_ALT",     "ALT_GR":  "LEFT_ALT",
-        "WIN":     "LEFT_GUI",     "CMD":     "LEFT_GUI",
-        "WINDOWS": "LEFT_GUI",     "COMMAND": "LEFT_GUI",
-        "WIN/CMD": "LEFT_GUI",     "WIN/COMMAND": "LEFT_GUI",
-        "DEL":     "DELETE",       "ESC":     "ESCAPE",
-        "UP":      "UP_ARROW",     "DOWN":    "DOWN_ARROW",
-        "LEFT":    "LEFT_ARROW",   "RIGHT":   "RIGHT_ARROW",
-    }
-    return aliases.get(key, key)
+    return _KEY_NORMALIZE.get(key, key)
+
+
+def parse_key_combo(text):
+    # Single pass: normalize each '+'-separated token, drop empties.
+    return [k for k in map(normalize_key_name, text.split("+")) if k]
 
 
 # Linux-specific: CIRCUITPY drive detection
 
-def find_circuitpy_drive():
-    """
-    Returns the mount point of the CIRCUITPY drive, or None if not found.
+_DRIVE_CACHE_TTL = 5.0
+_drive_cache = {"mp": None, "ts": 0.0}
+_PART_CACHE_TTL  = 2.0
+_part_cache      = {}   # all flag -> (timestamp, partitions)
+_SKIP_FSTYPES    = {"squashfs", "tmpfs", "devtmpfs", "proc", "sysfs"}
 
-    Strategy (tried in order for each readable mounted partition):
-      1. Mount path contains 'CIRCUITPY' — catches Fedora/KDE automounts at
-         /run/media/<user>/CIRCUITPY immediately.
-      2. Filesystem probe — the partition contains BOTH 'boot_out.txt' AND
-         'code.py'. Requiring both files reduces false-positive matches against
-         arbitrary USB drives that happen to contain a code.py at their root.
-         boot_out.txt is generated by CircuitPython on every boot and is
-         effectively unique to those devices. [FLAW-2 FIX]
-    """
-    for part in psutil.disk_partitions(all=True):
-        if not part.mountpoint or not part.fstype:
+
+def _disk_partitions(all_parts):
+    import psutil  # deferred: slow to import, only needed once a scan runs
+
+    hit = _part_cache.get(all_parts)
+    if hit and time.monotonic() - hit[0] < _PART_CACHE_TTL:
+        return hit[1]
+    parts = psutil.disk_partitions(all=all_parts)
+    _part_cache[all_parts] = (time.monotonic(), parts)
+    return parts
+
+
+_CIRCUITPY_MARKERS = frozenset(("boot_out.txt", "code.py"))
+
+
+def _has_circuitpy_files(mp):
+    # boot_out.txt is written by CircuitPython on every boot and code.py is
+    # the firmware entry point. One readdir of the (small) drive root instead
+    # of a stat() per file, stopping as soon as both have been seen.
+    missing = set(_CIRCUITPY_MARKERS)
+    with os.scandir(mp) as it:
+        for entry in it:
+            if entry.name in missing:
+                missing.discard(entry.name)
+                if not missing:
+                    return True
+    return False
+
+
+def _scan_partitions(partitions):
+    for part in partitions:
+        if not part.mountpoint or not part.fstype or part.fstype in _SKIP_FSTYPES:
             continue
         if "ro" in part.opts.split(","):
             continue
         mp = part.mountpoint
         try:
-            if "CIRCUITPY" in mp.upper():
-                return mp
-            if (os.path.exists(os.path.join(mp, "boot_out.txt")) and
-                    os.path.exists(os.path.join(mp, "code.py"))):
+            if "CIRCUITPY" in mp.upper() or _has_circuitpy_files(mp):
                 return mp
         except (PermissionError, OSError):
             continue
     return None
 
 
+def find_circuitpy_drive():
+    """
+    Returns the mount point of the CIRCUITPY drive, or None if not found.
+
+    Strategy (tried in order for each readable mounted partition):
+      1. Mount path contains 'CIRCUITPY' — catches Fedora/KDE automounts at
+         /run/media/<user>/CIRCUITPY immediately.
+      2. Filesystem probe — the partition root contains BOTH 'boot_out.txt'
+         AND 'code.py' (_has_circuitpy_files, one scandir pass). Requiring both
+         files reduces false-positive matches against arbitrary USB drives that
+         happen to contain a code.py at their root. boot_out.txt is generated
+         by CircuitPython on every boot and is effectively unique to those
+         devices. [FLAW-2 FIX]
+
+    Physical-device partitions (disk_partitions(all=False)) are scanned first;
+    the full all=True list is only consulted if that finds nothing. Pseudo
+    filesystems in _SKIP_FSTYPES are never probed.
+
+    A hit is cached for _DRIVE_CACHE_TTL seconds so that back-to-back
+    refresh/save calls skip the partition scan while the drive is still there.
+    """
+    cached = _drive_cache["mp"]
+    if (cached and time.monotonic() - _drive_cache["ts"] < _DRIVE_CACHE_TTL
+            and os.path.isfile(os.path.join(cached, "boot_out.txt"))):
+        return cached
+
+    mp = _scan_partitions(_disk_partitions(False)) or _scan_partitions(_disk_partitions(True))
+    if mp:
+        _drive_cache["mp"] = mp
+        _drive_cache["ts"] = time.monotonic()
+    return mp
+
+
 # Linux-specific: serial port detection
 
+_PICO_VID = 0x2E8A  # Raspberry Pico
+_PICO_PID = 0x000A  # CircuitPython CDC data port
+_PICO_PORT_MARKERS = ("Pico", "CircuitPython", "CDC")
+
+_PORT_CACHE_TTL = 3.0
+_port_cache = {"port": None, "ts": 0.0}
+_PORTS_LIST_TTL = 1.0
+_ports_list_cache = {"ports": [], "ts": 0.0, "hung": None}
+_comports_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+# Runs the reboot-port lookup alongside a drive scan. Separate from
+# _comports_pool, which the lookup itself waits on.
+_port_lookup_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+
+def _list_ports(timeout=4.0):
+    # comports() can hang for seconds (e.g. Bluetooth serial devices); give up
+    # after `timeout` instead of stalling the caller.
+    # The raw list is reused for _PORTS_LIST_TTL seconds, misses included; a
+    # timeout counts as an empty list, and no new call is queued behind the
+    # hung one until it returns.
+    if time.monotonic() - _ports_list_cache["ts"] < _PORTS_LIST_TTL:
+        return _ports_list_cache["ports"]
+    hung = _ports_list_cache["hung"]
+    if hung is not None and not hung.done():
+        return []
+
+    import serial.tools.list_ports
+
+    # Symlinked aliases (/dev/serial/by-id/...) would only duplicate entries.
+    future = _comports_pool.submit(serial.tools.list_ports.comports, include_links=False)
+    try:
+        ports = list(future.result(timeout=timeout))
+    except concurrent.futures.TimeoutError:
+        print("[PORTS] comports() timed out.")
+        _ports_list_cache["hung"] = future
+        ports = []
+    _ports_list_cache["ports"] = ports
+    _ports_list_cache["ts"]    = time.monotonic()
+    return ports
+
+
+def _pick_pico_port(ports):
+    # One pass: an exact VID/PID match wins immediately; description and
+    # ttyACM matches are remembered as fallbacks, in that priority order.
+    by_desc = by_tty = None
+    for port in ports:
+        if (by_tty is None and port.device.startswith("/dev/ttyACM")
+                and port.vid in (_PICO_VID, None)):
+            by_tty = port.device
+        if port.vid != _PICO_VID:
+            continue
+        if port.pid == _PICO_PID:
+            return port.device
+        if by_desc is None:
+            desc = port.description
+            if desc and any(marker in desc for marker in _PICO_PORT_MARKERS):
+                by_desc = port.device
+    return by_desc or by_tty
+
+
 def find_pico_serial_port_for_reboot():
     """
     Returns the device path (e.g. /dev/ttyACM0) of the Pico's data serial
     port, or None if not found.
 
-    Detection passes (in order):
+    The ports are enumerated once (list_ports.grep() would walk the same
+    ports and still need the full list for the fallbacks) and scanned in a
+    single pass; matches are ranked (in order):
       1. Exact USB VID (0x2E8A) + PID (0x000A) match — most reliable.
       2. Raspberry Pi VID with a Pico/CircuitPython/CDC description keyword.
       3. Any /dev/ttyACM* port whose VID matches or is unknown — last resort.
-    """
-    VID = 0x2E8A
-    PID = 0x000A
 
-    for port in serial.tools.list_ports.comports():
-        if port.vid == VID and getattr(port, "pid", None) == PID:
-            return port.device
+    A hit is cached for _PORT_CACHE_TTL seconds, since _refresh and
+    _save_and_reboot tend to ask for it back-to-back.
+    """
+    if _port_cache["port"] and time.monotonic() - _port_cache["ts"] < _PORT_CACHE_TTL:
+        return _port_cache["port"]
 
-    for port in serial.tools.list_ports.comports():
-        if port.vid == VID:
-            desc = port.description or ""
-            if any(k in desc for k in ("Pico", "CircuitPython", "CDC")):
-                return port.device
+    port = _pick_pico_port(_list_ports())
+    if port:
+        _port_cache["port"] = port
+        _port_cache["ts"] = time.monotonic()
+    return port
 
-    for port in serial.tools.list_ports.comports():
-        if port.device.startswith("/dev/ttyACM"):
-            if port.vid == VID or port.vid is None:
-                return port.device
 
-    return None
+def wait_for_pico_serial_port(timeout=5.0, interval=0.15):
+    """
+    Polls find_pico_serial_port_for_reboot until it returns a port or
+    `timeout` seconds pass. profiles.json is fsync'd before this is called,
+    so there is no need for a fixed settle delay.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        port = find_pico_serial_port_for_reboot()
+        if port or time.monotonic() >= deadline:
+            return port
+        time.sleep(interval)
 
 
 # Linux-specific: dialout group check
@@ -163,13 +385,26 @@ def check_dialout_group():
         return False
 
 
+def _set_low_latency(s):
+    # Linux: TIOCSSERIAL/ASYNC_LOW_LATENCY (the `setserial low_latency` knob).
+    # Other platforms don't implement it; the write still works without it.
+    try:
+        s.set_low_latency_mode(True)
+    except (AttributeError, NotImplementedError, OSError, ValueError):
+        pass
+
+
 def send_reboot_command(port_name):
+    import serial
 
     try:
         with serial.Serial(port_name, timeout=2, write_timeout=2) as s:
+            _set_low_latency(s)
             s.write(b"\x03")        # Ctrl+C — interrupt running code.py
+            s.flush()               # block until the byte has left the OS buffer
             time.sleep(0.15)        # wait for REPL to reach >>> prompt
             s.write(b"\x04")        # Ctrl+D — soft reboot
+            s.flush()
         return True
     except PermissionError:
         return "permission_error"
@@ -184,13 +419,11 @@ class ActionEditor(ctk.CTkToplevel):
 
     def __init__(self, parent, current_action_obj, profile_num, action_key):
         super().__init__(parent)
-        self.result = None
+        self.result  = None
+        self._closed = tk.BooleanVar(self, value=False)
 
-        self.title(f"Edit Action  —  Profile {profile_num}  /  {action_key.upper()}")
         self.geometry("450x450")
         self.transient(parent)
-        self.wait_visibility()
-        self.grab_set()
         self.resizable(False, False)
         self.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
@@ -231,7 +464,29 @@ class ActionEditor(ctk.CTkToplevel):
         ctk.CTkButton(bf, text="Cancel", command=self._on_cancel,
                       fg_color="gray").pack(side="right", padx=5)
 
-        self._load_current_action(current_action_obj)
+        self.reset(current_action_obj, profile_num, action_key)
+
+    def reset(self, action_obj, profile_num, action_key):
+        # The editor is kept alive between edits; reload it in place.
+        self.result = None
+        self.title(f"Edit Action  —  Profile {profile_num}  /  {action_key.upper()}")
+        self.simple_tab_var.set("nothing")
+        self.macro_entry_var.set("")
+        self.adv_macro_textbox.delete("1.0", "end")
+        self._load_current_action(action_obj)
+
+    def show(self):
+        self._closed.set(False)
+        self.deiconify()
+        self.wait_visibility()   # ensure window is mapped before grabbing
+        self.grab_set()
+        self.wait_variable(self._closed)
+        return self.result
+
+    def _close(self):
+        self.grab_release()
+        self.withdraw()
+        self._closed.set(True)
 
     def _load_current_action(self, action_obj):
         try:
@@ -242,8 +497,7 @@ class ActionEditor(ctk.CTkToplevel):
                     self._steps_to_script(action_obj.get("steps", [])))
             elif t == "macro":
                 self.tabs.set("Simple Macro")
-                keys = [MODIFIER_DISPLAY_MAP.get(k, k.upper()) for k in action_obj.get("keys", [])]
-                self.macro_entry_var.set(" + ".join(keys))
+                self.macro_entry_var.set(format_key_combo(action_obj.get("keys", ())))
             else:
                 self.tabs.set("Simple Action")
                 self.simple_tab_var.set(action_obj.get("action", "nothing"))
@@ -261,7 +515,7 @@ class ActionEditor(ctk.CTkToplevel):
             if not raw:
                 messagebox.showerror("Error", "Macro string is empty.", parent=self)
                 return
-            keys = [normalize_key_name(k) for k in raw.split("+") if k.strip()]
+            keys = parse_key_combo(raw)
             if not keys:
                 messagebox.showerror("Error", "Macro string is invalid.", parent=self)
                 return
@@ -275,13 +529,11 @@ class ActionEditor(ctk.CTkToplevel):
                 return
             self.result = {"type": "macro_advanced", "steps": steps}
 
-        self.grab_release()
-        self.destroy()
+        self._close()
 
     def _on_cancel(self):
         self.result = None
-        self.grab_release()
-        self.destroy()
+        self._close()
 
     def _script_to_steps(self, script_text):
         steps = []
@@ -305,7 +557,7 @@ class ActionEditor(ctk.CTkToplevel):
                 elif cmd in ("press", "tap", "release"):
                     if not args:
                         return None, f"Line {ln}: '{cmd}' requires at least one key."
-                    keys = [normalize_key_name(k) for k in args.split("+") if k.strip()]
+                    keys = parse_key_combo(args)
                     if not keys:
                         return None, f"Line {ln}: invalid keys for '{cmd}'."
                     steps.append({cmd: keys})
@@ -324,14 +576,11 @@ class ActionEditor(ctk.CTkToplevel):
                 if "wait" in step:
                     lines.append(f"wait {round(step['wait'] * 1000)}")
                 elif "press" in step:
-                    lines.append("press " + " + ".join(
-                        MODIFIER_DISPLAY_MAP.get(k, k.upper()) for k in step["press"]))
+                    lines.append("press " + format_key_combo(step["press"]))
                 elif "tap" in step:
-                    lines.append("tap " + " + ".join(
-                        MODIFIER_DISPLAY_MAP.get(k, k.upper()) for k in step["tap"]))
+                    lines.append("tap " + format_key_combo(step["tap"]))
                 elif "release" in step:
-                    lines.append("release " + " + ".join(
-                        MODIFIER_DISPLAY_MAP.get(k, k.upper()) for k in step["release"]))
+                    lines.append("release " + format_key_combo(step["release"]))
                 elif step.get("release_all"):
                     lines.append("release_all")
             except Exception as e:
@@ -357,6 +606,16 @@ class MultiKnobConfiguratorModern:
         self.root.minsize(980, 720)
         self.profile_vars   = {}
         self.action_labels  = {}
+        self._port_scan_lock = threading.Lock()
+        self._log_q = collections.deque()
+        self._log_lock = threading.Lock()
+        self._log_pending = False
+        self._work_q = queue.Queue()
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+        self._action_label_font = ctk.CTkFont(family="Consolas", size=13)
+        self.font_title = ctk.CTkFont(size=18, weight="bold")
+        self.font_header = ctk.CTkFont(size=14, weight="bold")
+        self._action_editor = None
         self.current_settings = self.load_gui_settings()
         self.main_frame = ctk.CTkFrame(root, corner_radius=8, fg_color="#0b1220")
         self.main_frame.pack(fill="both", expand=True, padx=12, pady=12)
@@ -376,11 +635,15 @@ class MultiKnobConfiguratorModern:
             self.log_add("WARNING: Not in the 'dialout' group — serial reboot may fail.")
             self.log_add("  Fix:  sudo usermod -aG dialout $USER   (then log out/in)")
             self.set_status("Warning: not in dialout group")
+        else:
+            # Look for the board once the window is up, so the first click is a
+            # cache hit. Skipped above so "Ready." doesn't hide the warning.
+            self.refresh_thread()
 
 
     def build_left(self):
         ctk.CTkLabel(self.left, text="KnobStudio  [Linux]",
-                     font=ctk.CTkFont(size=18, weight="bold")).pack(anchor="w", padx=14, pady=(10, 6))
+                     font=self.font_title).pack(anchor="w", padx=14, pady=(10, 6))
 
         gf = ctk.CTkFrame(self.left)
         gf.pack(fill="x", padx=12, pady=(0, 10))
@@ -393,7 +656,7 @@ class MultiKnobConfiguratorModern:
             lbl = ctk.CTkLabel(frame, width=28)
             lbl.grid(row=grid_row, column=col_start + 2, padx=(0, 12))
             ctk.CTkSlider(frame, from_=from_, to=to, number_of_steps=steps, variable=var,
-                          command=lambda v, l=lbl: l.configure(text=f"{int(v)}x")
+                          command=lambda v, l=lbl: l.configure(text=_SENS_LABELS[int(v)])
                           ).grid(row=grid_row, column=col_start + 1, padx=(0, 8), pady=8, sticky="ew")
             lbl.configure(text=f"{var.get()}x")
 
@@ -408,52 +671,50 @@ class MultiKnobConfiguratorModern:
         mouse_lbl = ctk.CTkLabel(gf, width=28)
         mouse_lbl.grid(row=1, column=5, padx=(0, 12))
         ctk.CTkSlider(gf, from_=1, to=10, number_of_steps=9, variable=self.sens_mouse,
-                      command=lambda v: mouse_lbl.configure(text=f"{int(v)}x")
+                      command=lambda v: mouse_lbl.configure(text=_SENS_LABELS[int(v)])
                       ).grid(row=1, column=1, columnspan=4, padx=(0, 8), pady=8, sticky="ew")
         mouse_lbl.configure(text=f"{self.sens_mouse.get()}x")
 
-        self.tabs = ctk.CTkTabview(self.left)
+        self.tabs = ctk.CTkTabview(self.left, command=self._on_tab_change)
         self.tabs.pack(fill="both", expand=True, padx=12, pady=8)
 
         for i in (1, 2, 3):
             self.tabs.add(f"Profile {i}")
-            tab = self.tabs.tab(f"Profile {i}")
-            tab.grid_columnconfigure(1, weight=1)
-            tab.grid_columnconfigure(2, weight=0)
-
-            self.profile_vars[i] = self.current_settings.get(f"profile{i}", {
-                k: {"type": "simple", "action": "nothing"} for k in _ALL_GESTURE_KEYS
-            })
+            self.profile_vars[i] = {**DEFAULT_PROFILE_TEMPLATE,
+                                    **self.current_settings.get(f"profile{i}", {})}
             self.action_labels[i] = {}
 
-            rows = [
-                ("Clockwise (CW):",   "cw",           False),
-                ("Counter-CW (CCW):", "ccw",          False),
-                ("Click:",            "click",        False),
-                ("Double Click:",     "double_click", False),
-                ("Triple Click:",     "triple_click", False),
-                ("Long Press:",       "long_press",   False),
-                ("Hold + CW:",        "cw_shifted",   True),
-                ("Hold + CCW:",       "ccw_shifted",  True),
-            ]
-            for row, (label, key, is_new) in enumerate(rows):
-                self._profile_row(tab, i, label, key, row, is_new=is_new)
-
+        # Only the visible tab gets its rows now; the others are filled in on
+        # first selection. profile_vars is complete either way, so saving works.
+        self._built_tabs = set()
         self.tabs.set("Profile 1")
+        self._build_profile_tab(1)
+
+    def _on_tab_change(self):
+        self._build_profile_tab(int(self.tabs.get().rsplit(" ", 1)[1]))
+
+    def _build_profile_tab(self, i):
+        if i in self._built_tabs:
+            return
+        self._built_tabs.add(i)
+        tab = self.tabs.tab(f"Profile {i}")
+        tab.grid_columnconfigure(1, weight=1)
+        tab.grid_columnconfigure(2, weight=0)
+        labels = self.action_labels[i]
+        for row, (label, key, is_new) in enumerate(_PROFILE_ROWS):
+            labels[key] = self._profile_row(tab, i, label, key, row, is_new=is_new)
 
     def _profile_row(self, tab, profile_index, label_text, action_key, row, is_new=False):
         pady = (12 if is_new else (10 if row == 0 else 8), 8)
         ctk.CTkLabel(tab, text=label_text).grid(row=row, column=0, sticky="w", padx=10, pady=pady)
-        self.profile_vars[profile_index].setdefault(
-            action_key, {"type": "simple", "action": "nothing"})
         action_obj  = self.profile_vars[profile_index][action_key]
         display_lbl = ctk.CTkLabel(tab, text=self._action_display_text(action_obj),
-                                   anchor="e", font=ctk.CTkFont(family="Consolas", size=13))
+                                   anchor="e", font=self._action_label_font)
         display_lbl.grid(row=row, column=1, padx=10, pady=pady, sticky="ew")
-        self.action_labels[profile_index][action_key] = display_lbl
         ctk.CTkButton(tab, text="Edit Action...", width=120,
                       command=lambda p=profile_index, k=action_key: self.open_action_editor(p, k)
                       ).grid(row=row, column=2, sticky="e", padx=10, pady=pady)
+        return display_lbl
 
     def _action_display_text(self, action_obj):
         try:
@@ -461,24 +722,27 @@ class MultiKnobConfiguratorModern:
             if t == "macro_advanced":
                 return "Macro: [Advanced Sequence]"
             if t == "macro":
-                keys = [MODIFIER_DISPLAY_MAP.get(k, k.upper()) for k in action_obj.get("keys", [])]
-                return "Macro: " + " + ".join(keys)
+                return "Macro: " + format_key_combo(action_obj.get("keys", ()))
             return action_obj.get("action", "nothing")
         except Exception:
             return "Error"
 
     def open_action_editor(self, profile_index, action_key):
-        editor = ActionEditor(self.root, self.profile_vars[profile_index][action_key],
-                              profile_index, action_key)
-        self.root.wait_window(editor)
-        if editor.result:
-            self.profile_vars[profile_index][action_key] = editor.result
+        current = self.profile_vars[profile_index][action_key]
+        editor  = self._action_editor
+        if editor is None or not editor.winfo_exists():
+            editor = self._action_editor = ActionEditor(self.root, current, profile_index, action_key)
+        else:
+            editor.reset(current, profile_index, action_key)
+        result = editor.show()
+        if result:
+            self.profile_vars[profile_index][action_key] = result
             self.action_labels[profile_index][action_key].configure(
-                text=self._action_display_text(editor.result))
+                text=self._action_display_text(result))
 
     def build_right(self):
         ctk.CTkLabel(self.right, text="Control & Status",
-                     font=ctk.CTkFont(size=14, weight="bold")).pack(pady=(10, 6))
+                     font=self.font_header).pack(pady=(10, 6))
 
         qf = ctk.CTkFrame(self.right)
         qf.pack(fill="x", padx=10, pady=(4, 8))
@@ -487,11 +751,10 @@ class MultiKnobConfiguratorModern:
         self.reboot_port_label = ctk.CTkLabel(qf, text="Reboot port: --", anchor="w")
         self.reboot_port_label.pack(fill="x", padx=10, pady=(0, 8))
 
-        lf = ctk.CTkFrame(self.right)
-        lf.pack(fill="both", expand=True, padx=10, pady=4)
-        ctk.CTkLabel(lf, text="Status Log:").pack(anchor="w", padx=10, pady=(8, 2))
-        self.log = ctk.CTkTextbox(lf, height=10, wrap="word")
-        self.log.pack(fill="both", expand=True, padx=10, pady=(0, 8))
+        # The textbox draws its own background, so it needs no wrapping frame.
+        ctk.CTkLabel(self.right, text="Status Log:").pack(anchor="w", padx=20, pady=(8, 2))
+        self.log = ctk.CTkTextbox(self.right, height=10, wrap="word")
+        self.log.pack(fill="both", expand=True, padx=20, pady=(0, 8))
         self.log.configure(state="disabled")
 
         pf = ctk.CTkFrame(self.right)
@@ -510,50 +773,77 @@ class MultiKnobConfiguratorModern:
         ctk.CTkLabel(bar, text="Advanced Macro Edition — Linux", anchor="e").pack(side="right", padx=10)
 
     def save_thread(self):
+        if not self._port_scan_lock.acquire(blocking=False):
+            self.log_add("Busy: a device search is still running, try again in a moment.")
+            return
         self.save_btn.configure(state="disabled")
         self.refresh_btn.configure(state="disabled")
 
+        # Shallow copies are enough: edits replace action objects, never mutate them.
         snapshot = {
             "s_vol":   self._safe_int(self.sens_vol.get(), 2),
             "s_scr":   self._safe_int(self.sens_scr.get(), 1),
             "s_mouse": self._safe_int(self.sens_mouse.get(), 4),
-            "p1":      json.loads(json.dumps(self.profile_vars.get(1, {}))),
-            "p2":      json.loads(json.dumps(self.profile_vars.get(2, {}))),
-            "p3":      json.loads(json.dumps(self.profile_vars.get(3, {}))),
+            "p1":      dict(self.profile_vars.get(1, {})),
+            "p2":      dict(self.profile_vars.get(2, {})),
+            "p3":      dict(self.profile_vars.get(3, {})),
         }
-        threading.Thread(target=self._save_and_reboot, args=(snapshot,), daemon=True).start()
-        self.animate_progress()
+        self._work_q.put((self._save_and_reboot, (snapshot,)))
+        self._start_progress()
 
     def refresh_thread(self):
-        threading.Thread(target=self._refresh, daemon=True).start()
-
-    def animate_progress(self):
-        def step():
-            val = self.progress.get() + 0.03
-            if val > 0.9:
-                val = 0.1
-            self.progress.set(val)
-            if str(self.save_btn.cget("state")) == "disabled":
-                self.root.after(120, step)
-            else:
-                self.progress.set(1.0)
-                self.root.after(700, lambda: self.progress.set(0))
-        step()
+        if not self._port_scan_lock.acquire(blocking=False):
+            return
+        self.save_btn.configure(state="disabled")
+        self.refresh_btn.configure(state="disabled")
+        self._work_q.put((self._refresh, ()))
+
+    def _worker_loop(self):
+        # Single long-lived worker: save and refresh run one at a time, in order.
+        while True:
+            fn, args = self._work_q.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                self.log_add(f"Worker error: {e}")
+
+    def _start_progress(self):
+        # Indeterminate mode animates inside CTk; no Python polling loop needed.
+        self.progress.configure(mode="indeterminate")
+        self.progress.start()
+
+    def _stop_progress(self):
+        self.progress.stop()
+        self.progress.configure(mode="determinate")
+        self.progress.set(1.0)
+        self.root.after(700, lambda: self.progress.set(0))
 
     def log_add(self, text):
-        def _update():
-            self.log.configure(state="normal")
-            self.log.insert("end", f"{time.strftime('%H:%M:%S')} — {text}\n")
-            self.log.see("end")
-            self.log.configure(state="disabled")
-        self.root.after(0, _update)
+        # Lines are buffered and written in one batch; a flush is only
+        # scheduled when the buffer goes from empty to non-empty.
+        with self._log_lock:
+            self._log_q.append(f"{time.strftime('%H:%M:%S')} — {text}\n")
+            if self._log_pending:
+                return
+            self._log_pending = True
+        self.root.after(50, self._flush_log)
+
+    def _flush_log(self):
+        with self._log_lock:
+            lines = "".join(self._log_q)
+            self._log_q.clear()
+            self._log_pending = False
+        self.log.configure(state="normal")
+        self.log.insert("end", lines)
+        self.log.see("end")
+        self.log.configure(state="disabled")
 
     def set_status(self, text):
         self.root.after(0, lambda: self.status.set(text))
 
 
     def _save_and_reboot(self, snap):
-
+        outcome = None   # (final status, messagebox function, title, text)
         try:
             self.set_status("Finding CIRCUITPY...")
             self.log_add("Searching for drive...")
@@ -563,13 +853,12 @@ class MultiKnobConfiguratorModern:
                 self.log_add("CIRCUITPY not found.")
                 self.log_add("  Is the Pico plugged in?")
                 self.log_add("  Diagnose:  lsblk -o NAME,LABEL,MOUNTPOINT")
-                self.set_status("Error: drive not found")
-                self.root.after(0, lambda: messagebox.showerror(
+                outcome = ("Error: drive not found", messagebox.showerror,
                     "Drive Not Found",
                     "CIRCUITPY drive not found.\n\n"
                     "Make sure the Pico is plugged in and mounted.\n\n"
                     "Diagnose with:\n    lsblk -o NAME,LABEL,MOUNTPOINT"
-                ))
+                )
                 return
 
             self.log_add(f"Drive found: {drive}")
@@ -582,15 +871,10 @@ class MultiKnobConfiguratorModern:
             p2      = snap["p2"]
             p3      = snap["p3"]
 
-            cur_prof = 1
-            if os.path.exists(json_path):
-                try:
-                    with open(json_path, "r", encoding="utf-8") as f:
-                        cur_prof = json.load(f).get("current_profile", 1)
-                except Exception:
-                    pass
+            cur_prof = read_current_profile(json_path)
 
             cfg = {
+                "_version":           CONFIG_VERSION,
                 "current_profile":    cur_prof,
                 "sensitivity_volume": s_vol,
                 "sensitivity_scroll": s_scr,
@@ -599,17 +883,16 @@ class MultiKnobConfiguratorModern:
             }
 
 
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(cfg, f, indent=2, ensure_ascii=False)
-                f.flush()
-                os.fsync(f.fileno())
+            payload = _json_dumps(cfg)
+            _write_atomic(json_path, payload)
 
-            self.save_gui_settings(p1, p2, p3, s_vol, s_scr, s_mouse)
+            # The local cache copy must not hold up the reboot: it is queued on
+            # the worker and written once this save has finished.
+            self._work_q.put((self.save_gui_settings, (payload,)))
             self.log_add("File saved and flushed to device.")
-            self.set_status("Finishing write...")
-            time.sleep(0.5)
+            self.set_status("Finding serial port...")
 
-            port = find_pico_serial_port_for_reboot()
+            port = wait_for_pico_serial_port()
             if port:
                 self.root.after(0, lambda: self.reboot_port_label.configure(
                     text=f"Reboot port: {port}"))
@@ -620,71 +903,88 @@ class MultiKnobConfiguratorModern:
                 if result == "permission_error":
                     self.log_add("FAILED: Permission denied on serial port.")
                     self.log_add("  Fix:  sudo usermod -aG dialout $USER  (then log out/in)")
-                    self.set_status("Permission error — see log")
-                    self.root.after(0, lambda: messagebox.showerror(
+                    outcome = ("Permission error — see log", messagebox.showerror,
                         "Serial Permission Error",
                         f"Cannot open {port}: Permission denied.\n\n"
                         "Your user is not in the 'dialout' group.\n\n"
                         "Run this in a terminal, then log out and back in:\n\n"
                         "    sudo usermod -aG dialout $USER\n\n"
                         "Settings were saved. Unplug and replug the Pico to apply them now."
-                    ))
+                    )
                 elif result is True:
                     self.log_add("Reboot command sent.")
-                    self.set_status("Complete.")
-                    self.root.after(0, lambda: messagebox.showinfo("Success", "Saved & Rebooted!"))
+                    outcome = ("Complete.", messagebox.showinfo, "Success", "Saved & Rebooted!")
                 else:
                     self.log_add("Failed to send reboot command.")
-                    self.set_status("Manual reboot required.")
-                    self.root.after(0, lambda: messagebox.showwarning(
+                    outcome = ("Manual reboot required.", messagebox.showwarning,
                         "Warning",
                         "Saved, but failed to send the reboot command.\n"
                         "Unplug and replug the Pico to apply settings."
-                    ))
+                    )
             else:
                 self.log_add("Serial port not found.")
                 self.log_add("  Check:  ls /dev/ttyACM* /dev/ttyUSB*")
-                self.set_status("Complete.")
-                self.root.after(0, lambda: messagebox.showinfo(
+                outcome = ("Complete.", messagebox.showinfo,
                     "Success",
                     "Settings saved!\n"
                     "The Pico will apply them on its next reboot.\n\n"
                     "(Serial port not found — unplug and replug the Pico.)"
-                ))
+                )
 
         except PermissionError as e:
             self.log_add(f"Permission error writing to drive: {e}")
-            self.set_status("Permission error — drive write failed")
-            self.root.after(0, lambda: messagebox.showerror(
+            outcome = ("Permission error — drive write failed", messagebox.showerror,
                 "Write Permission Error",
                 f"Could not write to the CIRCUITPY drive:\n{e}\n\n"
                 "The drive may be mounted read-only.\n"
                 "Unplug and replug the Pico, then try again."
-            ))
+            )
         except Exception as e:
             self.log_add(f"Error: {e}")
-            self.set_status("Write Error")
-            self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
+            outcome = ("Write Error", messagebox.showerror, "Error", str(e))
         finally:
-
             try:
-                self.root.after(0, lambda: self.save_btn.configure(state="normal"))
-                self.root.after(0, lambda: self.refresh_btn.configure(state="normal"))
+                self.root.after(0, self._finish_save, outcome)
             except Exception:
                 pass
+            self._port_scan_lock.release()
+
+    def _finish_save(self, outcome):
+        # All end-of-save UI updates in a single Tk callback.
+        self.save_btn.configure(state="normal")
+        self.refresh_btn.configure(state="normal")
+        self._stop_progress()
+        if outcome:
+            status, show, title, text = outcome
+            self.status.set(status)
+            show(title, text)
 
     def _refresh(self):
-        self.set_status("Searching...")
-        drive = find_circuitpy_drive()
-        self.log_add(f"Drive: {drive if drive else '-- (not found)'}")
-        if not drive:
-            self.log_add("  Diagnose:  lsblk -o NAME,LABEL,MOUNTPOINT")
-        port = find_pico_serial_port_for_reboot()
-        self.root.after(0, lambda: self.reboot_port_label.configure(
-            text=f"Reboot port: {port if port else '--'}"))
-        if not port:
-            self.log_add("  Check serial:  ls /dev/ttyACM* /dev/ttyUSB*")
-        self.set_status("Ready.")
+        port = None
+        try:
+            self.set_status("Searching...")
+            # The two lookups are independent; run the port scan alongside the
+            # drive scan on this worker thread.
+            f_port = _port_lookup_pool.submit(find_pico_serial_port_for_reboot)
+            drive  = find_circuitpy_drive()
+            port   = f_port.result()
+            self.log_add(f"Drive: {drive if drive else '-- (not found)'}")
+            if not drive:
+                self.log_add("  Diagnose:  lsblk -o NAME,LABEL,MOUNTPOINT")
+            if not port:
+                self.log_add("  Check serial:  ls /dev/ttyACM* /dev/ttyUSB*")
+        finally:
+            try:
+                self.root.after(0, self._finish_refresh, port)
+            except Exception:
+                pass
+            self._port_scan_lock.release()
+
+    def _finish_refresh(self, port):
+        self.save_btn.configure(state="normal")
+        self.refresh_btn.configure(state="normal")
+        self.reboot_port_label.configure(text=f"Reboot port: {port if port else '--'}")
+        self.status.set("Ready.")
 
   
     @staticmethod
@@ -694,35 +994,24 @@ class MultiKnobConfiguratorModern:
         except Exception:
             return default
 
-    def save_gui_settings(self, p1, p2, p3, sv, ss, sm):
-        data = {
-            "profile1": p1, "profile2": p2, "profile3": p3,
-            "sensitivity_volume": sv, "sensitivity_scroll": ss, "sensitivity_mouse": sm,
-        }
+    def save_gui_settings(self, payload):
+        # payload is the serialized profiles.json, reused as the local cache.
         try:
-            with open("configurator_settings.json", "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            _write_atomic("configurator_settings.json", payload)
         except Exception as e:
             self.log_add(f"Error saving GUI settings: {e}")
 
     def load_gui_settings(self):
-
-        def _noop():
-            return {"type": "simple", "action": "nothing"}
-
-        def _fresh_base():
-            return {k: _noop() for k in _ALL_GESTURE_KEYS}
-
-        p1 = {**_fresh_base(),
+        p1 = {**DEFAULT_PROFILE_TEMPLATE,
               "cw":         {"type": "simple", "action": "volume_up"},
               "ccw":        {"type": "simple", "action": "volume_down"},
               "click":      {"type": "simple", "action": "mute"},
               "long_press": {"type": "simple", "action": "next_profile"}}
-        p2 = {**_fresh_base(),
+        p2 = {**DEFAULT_PROFILE_TEMPLATE,
               "cw":    {"type": "simple", "action": "scroll_up"},
               "ccw":   {"type": "simple", "action": "scroll_down"},
               "click": {"type": "simple", "action": "play_pause"}}
-        p3 = {**_fresh_base(),
+        p3 = {**DEFAULT_PROFILE_TEMPLATE,
               "cw":          {"type": "simple", "action": "mouse_scroll_v_pos"},
               "ccw":         {"type": "simple", "action": "mouse_scroll_v_neg"},
               "click":       {"type": "simple", "action": "mouse_click_middle"},
@@ -732,11 +1021,17 @@ class MultiKnobConfiguratorModern:
              "sensitivity_volume": 2, "sensitivity_scroll": 1, "sensitivity_mouse": 4}
 
         try:
-            with open("configurator_settings.json", "r", encoding="utf-8") as f:
-                loaded = json.load(f)
+            with open("configurator_settings.json", "rb") as f:
+                loaded = _json_loads(f.read())
+            version = loaded.get("_version", 0)
+            if isinstance(loaded.get("profiles"), list):
+                loaded = self._from_device_layout(loaded)
 
             p1_loaded = loaded.get("profile1", {})
-            if isinstance(p1_loaded.get("cw"), str):
+            if version >= CONFIG_VERSION:
+                d.update(loaded)
+                self.log_add("Loaded v4.0+ (Advanced Macro) config.")
+            elif isinstance(p1_loaded.get("cw"), str):
                 self.log_add("Old v1.0 config detected — migrating to v4.0...")
                 d = self._migrate_v1_to_v4(loaded)
             elif "cw_shifted" not in p1_loaded:
@@ -744,13 +1039,13 @@ class MultiKnobConfiguratorModern:
                 d.update(loaded)
                 for i in (1, 2, 3):
                     for k in ("cw_shifted", "ccw_shifted", "double_click", "triple_click"):
-                        d[f"profile{i}"].setdefault(k, {"type": "simple", "action": "nothing"})
+                        d[f"profile{i}"].setdefault(k, DEFAULT_ACTION_OBJECT)
             elif "double_click" not in p1_loaded:
                 self.log_add("v3.0 config detected — migrating to v4.0...")
                 d.update(loaded)
                 for i in (1, 2, 3):
                     for k in ("double_click", "triple_click"):
-                        d[f"profile{i}"].setdefault(k, {"type": "simple", "action": "nothing"})
+                        d[f"profile{i}"].setdefault(k, DEFAULT_ACTION_OBJECT)
             else:
                 d.update(loaded)
                 self.log_add("Loaded v4.0+ (Advanced Macro) config.")
@@ -760,6 +1055,14 @@ class MultiKnobConfiguratorModern:
             self.log_add(f"Error loading settings: {e} — loading defaults.")
         return d
 
+    @staticmethod
+    def _from_device_layout(cfg):
+        result = {k: cfg[k] for k in
+                  ("sensitivity_volume", "sensitivity_scroll", "sensitivity_mouse") if k in cfg}
+        for i, profile in enumerate(cfg["profiles"][:3], 1):
+            result[f"profile{i}"] = profile
+        return result
+
     def _migrate_v1_to_v4(self, v1):
         result = {
             "sensitivity_volume": v1.get("sensitivity_volume", 2),
@@ -771,7 +1074,7 @@ class MultiKnobConfiguratorModern:
             new = {k: {"type": "simple", "action": old.get(k, "nothing")}
                    for k in ("cw", "ccw", "click", "long_press")}
             for k in ("cw_shifted", "ccw_shifted", "double_click", "triple_click"):
-                new[k] = {"type": "simple", "action": "nothing"}
+                new[k] = DEFAULT_ACTION_OBJECT
             result[f"profile{i}"] = new
         return result
 
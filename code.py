@@ -30,6 +30,17 @@ ENCODER_CLK = board.GP13
 ENCODER_DT  = board.GP14
 ENCODER_SW  = board.GP15
 
+# Quadrature edges per detent. 4 suits the common 20-detent EC11 knobs: one
+# physical click moves encoder.position by exactly 1. Use 2 for half-step
+# encoders (two position changes per click).
+ENCODER_DIVISOR = 4
+
+# Pacing between repeated HID reports for one detent. Hosts coalesce or drop
+# consumer-control reports that arrive back to back, so volume keeps a longer
+# gap than keyboard scrolling.
+VOLUME_STEP_DELAY = 0.015
+SCROLL_STEP_DELAY = 0.005
+
 # A brief startup delay lets the host finish POST before the Pico enumerates as a composite HID device, which can otherwise cause BIOS/UEFI hangs.
 
 print("[SYSTEM] Waiting 5 s for host POST...")
@@ -51,7 +62,7 @@ except Exception as e:
 
 # Hardware Init
 
-encoder   = rotaryio.IncrementalEncoder(ENCODER_CLK, ENCODER_DT, divisor=4)
+encoder   = rotaryio.IncrementalEncoder(ENCODER_CLK, ENCODER_DT, divisor=ENCODER_DIVISOR)
 button_sw = digitalio.DigitalInOut(ENCODER_SW)
 button_sw.direction = digitalio.Direction.INPUT
 button_sw.pull      = digitalio.Pull.UP
@@ -65,9 +76,20 @@ profiles_data         = {}
 sensitivity_volume    = 2
 sensitivity_scroll    = 1
 sensitivity_mouse     = 4
+active_profile        = None    # compiled_profiles[current_profile_index]
+active_turn           = None    # (ccw, cw) entries of active_profile
+active_shift_turn     = None    # (ccw_shifted, cw_shifted) entries
 
 
 # Profile Persistence
+# A profile switch is written back only after the knob has been idle for
+# PROFILE_SAVE_DELAY_NS, so cycling through profiles costs one flash write.
+# main() pushes the deadline forward on every active iteration, so the write
+# never lands mid-spin.
+
+PROFILE_SAVE_DELAY_NS = 5000000000    # 5 s in nanoseconds
+profile_save_pending  = False         # a switch is waiting to be written
+
 
 def save_current_profile_index(index):
     global profiles_data
@@ -93,42 +115,61 @@ def switch_profile(target_index):
     global current_profile_index
     if 0 <= target_index < num_profiles:
         current_profile_index = target_index
+        set_active_profile(target_index)
         print(f"[SYSTEM] Profile -> {current_profile_index + 1}")
-        save_current_profile_index(current_profile_index)
+        schedule_profile_save()
     else:
         print(f"[SYSTEM] Invalid profile index: {target_index}")
 
 
+def schedule_profile_save():
+    global profile_save_pending
+    profile_save_pending = True
+
+
+def flush_profile_save():
+    global profile_save_pending
+    profile_save_pending = False
+    save_current_profile_index(current_profile_index)
+
+
 def next_profile():
     switch_profile((current_profile_index + 1) % num_profiles)
 
 
 # Mouse Helpers
+# Bound methods and codes are captured as default arguments, so each call is
+# a local load instead of a global + attribute lookup. sensitivity_mouse stays
+# a global read: it is only known after the config is loaded below.
 
-def _mouse_move_x_pos():   mouse.move(x=sensitivity_mouse)
-def _mouse_move_x_neg():   mouse.move(x=-sensitivity_mouse)
-def _mouse_move_y_pos():   mouse.move(y=sensitivity_mouse)
-def _mouse_move_y_neg():   mouse.move(y=-sensitivity_mouse)
-def _mouse_scroll_v_pos(): mouse.move(wheel=1)
-def _mouse_scroll_v_neg(): mouse.move(wheel=-1)
-def _mouse_scroll_h_pos(): mouse.move(wheel=1)
-def _mouse_scroll_h_neg(): mouse.move(wheel=-1)
+def _mouse_move_x_pos(_move=mouse.move):   _move(x=sensitivity_mouse)
+def _mouse_move_x_neg(_move=mouse.move):   _move(x=-sensitivity_mouse)
+def _mouse_move_y_pos(_move=mouse.move):   _move(y=sensitivity_mouse)
+def _mouse_move_y_neg(_move=mouse.move):   _move(y=-sensitivity_mouse)
+def _mouse_scroll_v_pos(_move=mouse.move): _move(wheel=1)
+def _mouse_scroll_v_neg(_move=mouse.move): _move(wheel=-1)
+def _mouse_scroll_h_pos(_move=mouse.move): _move(wheel=1)
+def _mouse_scroll_h_neg(_move=mouse.move): _move(wheel=-1)
 
 
 # Simple Actions Map
 
+_cc_send     = cc.send
+_kbd_send    = kbd.send
+_mouse_click = mouse.click
+
 SIMPLE_ACTIONS_MAP = {
     "nothing":              lambda: None,
-    "volume_up":            lambda: cc.send(ConsumerControlCode.VOLUME_INCREMENT),
-    "volume_down":          lambda: cc.send(ConsumerControlCode.VOLUME_DECREMENT),
-    "mute":                 lambda: cc.send(ConsumerControlCode.MUTE),
-    "play_pause":           lambda: cc.send(ConsumerControlCode.PLAY_PAUSE),
-    "next_track":           lambda: cc.send(ConsumerControlCode.SCAN_NEXT_TRACK),
-    "prev_track":           lambda: cc.send(ConsumerControlCode.SCAN_PREVIOUS_TRACK),
-    "scroll_up":            lambda: kbd.send(Keycode.UP_ARROW),
-    "scroll_down":          lambda: kbd.send(Keycode.DOWN_ARROW),
-    "undo":                 lambda: kbd.send(Keycode.LEFT_CONTROL, Keycode.Z),
-    "redo":                 lambda: kbd.send(Keycode.LEFT_CONTROL, Keycode.Y),
+    "volume_up":            lambda _s=_cc_send, _k=ConsumerControlCode.VOLUME_INCREMENT: _s(_k),
+    "volume_down":          lambda _s=_cc_send, _k=ConsumerControlCode.VOLUME_DECREMENT: _s(_k),
+    "mute":                 lambda _s=_cc_send, _k=ConsumerControlCode.MUTE: _s(_k),
+    "play_pause":           lambda _s=_cc_send, _k=ConsumerControlCode.PLAY_PAUSE: _s(_k),
+    "next_track":           lambda _s=_cc_send, _k=ConsumerControlCode.SCAN_NEXT_TRACK: _s(_k),
+    "prev_track":           lambda _s=_cc_send, _k=ConsumerControlCode.SCAN_PREVIOUS_TRACK: _s(_k),
+    "scroll_up":            lambda _s=_kbd_send, _k=Keycode.UP_ARROW: _s(_k),
+    "scroll_down":          lambda _s=_kbd_send, _k=Keycode.DOWN_ARROW: _s(_k),
+    "undo":                 lambda _s=_kbd_send, _m=Keycode.LEFT_CONTROL, _k=Keycode.Z: _s(_m, _k),
+    "redo":                 lambda _s=_kbd_send, _m=Keycode.LEFT_CONTROL, _k=Keycode.Y: _s(_m, _k),
     "mouse_move_x_pos":     _mouse_move_x_pos,
     "mouse_move_x_neg":     _mouse_move_x_neg,
     "mouse_move_y_pos":     _mouse_move_y_pos,
@@ -137,9 +178,9 @@ SIMPLE_ACTIONS_MAP = {
     "mouse_scroll_v_neg":   _mouse_scroll_v_neg,
     "mouse_scroll_h_pos":   _mouse_scroll_h_pos,
     "mouse_scroll_h_neg":   _mouse_scroll_h_neg,
-    "mouse_click_left":     lambda: mouse.click(Mouse.LEFT_BUTTON),
-    "mouse_click_right":    lambda: mouse.click(Mouse.RIGHT_BUTTON),
-    "mouse_click_middle":   lambda: mouse.click(Mouse.MIDDLE_BUTTON),
+    "mouse_click_left":     lambda _c=_mouse_click, _b=Mouse.LEFT_BUTTON: _c(_b),
+    "mouse_click_right":    lambda _c=_mouse_click, _b=Mouse.RIGHT_BUTTON: _c(_b),
+    "mouse_click_middle":   lambda _c=_mouse_click, _b=Mouse.MIDDLE_BUTTON: _c(_b),
     "next_profile":         next_profile,
     "switch_profile_1":     lambda: switch_profile(0),
     "switch_profile_2":     lambda: switch_profile(1),
@@ -259,30 +300,36 @@ def _safe_int(val, default):
         return default
 
 
+# Top-level keys that must hold an integer (or something int() accepts).
+_CONFIG_INT_KEYS = ("current_profile", "sensitivity_volume",
+                    "sensitivity_scroll", "sensitivity_mouse")
+
+
 def is_valid_config(config):
+    # One pass per level: a missing key reads as None and fails the same
+    # check as a wrong type, so there is no separate presence scan.
+    if not isinstance(config, dict):
+        return False
     try:
-        required_top = ("current_profile", "sensitivity_volume",
-                        "sensitivity_scroll", "sensitivity_mouse", "profiles")
-        if not all(k in config for k in required_top):
-            return False
-
-        for key in ("current_profile", "sensitivity_volume",
-                    "sensitivity_scroll", "sensitivity_mouse"):
-            raw = config[key]
+        for key in _CONFIG_INT_KEYS:
+            raw = config.get(key)
             if raw is None or isinstance(raw, (list, dict, bool)):
                 return False
-            try:
-                int(raw)
-            except (TypeError, ValueError):
-                return False
-        if not (isinstance(config["profiles"], list) and len(config["profiles"]) >= 3):
+            int(raw)
+
+        profiles = config.get("profiles")
+        if not (isinstance(profiles, list) and len(profiles) >= 3):
             return False
-        for profile in config["profiles"]:
+        for profile in profiles:
+            if not isinstance(profile, dict):
+                return False
             for key in _ALL_GESTURE_KEYS:
                 action_obj = profile.get(key)
                 if not (isinstance(action_obj, dict) and "type" in action_obj):
                     return False
         return True
+    except (TypeError, ValueError):
+        return False
     except Exception as e:
         print(f"[VALIDATE] {e}")
         return False
@@ -339,113 +386,216 @@ if not 1 <= sensitivity_scroll <= 10: sensitivity_scroll = 1
 if not 1 <= sensitivity_mouse <= 10:  sensitivity_mouse  = 4
 
 
-# Loop State Variables
+# Loop Timing
 
-last_position        = encoder.position
-# States: 0=Released  1=Pressed/awaiting  2=LongPress/awaiting release  3=Shifted
-button_state         = 0
-button_press_time    = 0            # integer nanoseconds (time.monotonic_ns())
-LONG_PRESS_NS        = 800000000    # 800 ms in nanoseconds
-click_count          = 0
-last_release_time    = 0
+LONG_PRESS_NS          = 800000000    # 800 ms in nanoseconds
 MULTI_CLICK_TIMEOUT_NS = 300000000    # 300 ms in nanoseconds
 
+# Software debounce is time-based, so the window stays the same however fast
+# the loop polls.
+DEBOUNCE_NS            = 10000000     # 10 ms of stable readings
+
+# 1 ms per iteration while the knob is in use; after it goes quiet the sleep
+# grows by 1 ms per iteration up to IDLE_SLEEP_MAX_MS.
+IDLE_SLEEP_MAX_MS      = 10
 
-# Software Debounce State
+# in_waiting goes through the USB stack; a REBOOT request can wait 100 ms.
+SERIAL_POLL_NS         = 100000000
 
-DEBOUNCE_COUNT        = 2
-_btn_stable_count     = 0
-_btn_last_raw         = False   # last raw reading (pre-debounce)
-button_debounced      = False   # debounced state exposed to state machine
+
+# Error Reporting
+# Printing to the serial console (and formatting tracebacks) can stall the
+# loop for tens of ms, so runtime errors are reported at most once per
+# ERROR_LOG_INTERVAL_NS, with a count of those suppressed in between.
+
+ERROR_LOG_INTERVAL_NS  = 1000000000    # 1 s in nanoseconds
+_err_count             = 0
+_err_next_log_at       = 0
+
+
+def log_error(tag, e):
+    global _err_count, _err_next_log_at
+    _err_count += 1
+    now = time.monotonic_ns()
+    if now < _err_next_log_at:
+        return
+    _err_next_log_at = now + ERROR_LOG_INTERVAL_NS
+    if _err_count > 1:
+        print(f"[{tag}] {e} (+{_err_count - 1} suppressed)")
+    else:
+        print(f"[{tag}] {e}")
+    _err_count = 0
 
 
 # HID Action Executor
 
-def execute_hid_action(action_key):
+# Encoder-driven gestures; only these honour the volume/scroll sensitivity.
+_ROTARY_KEYS  = ("cw", "ccw", "cw_shifted", "ccw_shifted")
+GESTURE_INDEX = {k: i for i, k in enumerate(_ALL_GESTURE_KEYS)}
+
+
+def _resolve_keycodes(names, where):
+    # Unknown names are reported once here instead of being skipped silently
+    # on every press.
+    codes = []
+    for k in names:
+        if k in KEYNAME_TO_KEYCODE:
+            codes.append(KEYNAME_TO_KEYCODE[k])
+        else:
+            print(f"[MACRO] {where}: unknown key '{k}' ignored.")
+    return tuple(codes)
 
+
+def _make_macro(keycodes, _press=kbd.press, _release_all=kbd.release_all):
+    def run():
+        try:
+            _press(*keycodes)
+            time.sleep(0.01)
+            _release_all()
+        except Exception as e:
+            log_error("MACRO", e)
+            _release_all()
+    return run
+
+
+# Advanced macro steps, compiled to (op, argument) pairs
+_STEP_SKIP, _STEP_PRESS, _STEP_RELEASE, _STEP_TAP, _STEP_WAIT, _STEP_RELEASE_ALL = range(6)
+
+
+def _compile_steps(steps, where):
+    compiled = []
+    for step in steps:
+        op, arg = _STEP_SKIP, None
+        if "press" in step:
+            op, arg = _STEP_PRESS, _resolve_keycodes(step["press"], where)
+        elif "release" in step:
+            op, arg = _STEP_RELEASE, _resolve_keycodes(step["release"], where)
+        elif "tap" in step:
+            op, arg = _STEP_TAP, _resolve_keycodes(step["tap"], where)
+        elif "wait" in step:
+            try:
+                op, arg = _STEP_WAIT, float(step["wait"])
+            except Exception:
+                print(f"[MACRO_ADV] {where}: invalid wait: {step['wait']}")
+        elif step.get("release_all"):
+            op = _STEP_RELEASE_ALL
+        if op in (_STEP_PRESS, _STEP_RELEASE, _STEP_TAP) and not arg:
+            op = _STEP_SKIP
+        compiled.append((op, arg))
+    return tuple(compiled)
+
+
+def _run_macro_advanced(steps):
+    if not steps:
+        print("[MACRO_ADV] 'steps' list is empty.")
+        return
     try:
-        profile     = profiles_data["profiles"][current_profile_index]
-        action_obj  = profile.get(action_key, _NOOP_ACTION)
-        action_type = action_obj.get("type", "simple")
-
-        if action_type == "simple":
-            action_name = action_obj.get("action", "nothing")
-            action_func = SIMPLE_ACTIONS_MAP.get(action_name, SIMPLE_ACTIONS_MAP["nothing"])
-
-            multiplier     = 1
-            delay_per_step = 0.005
-
-            if action_key in ("cw", "ccw", "cw_shifted", "ccw_shifted"):
-                if action_name in ("volume_up", "volume_down"):
-                    multiplier     = max(1, round(sensitivity_volume / 2))
-                    delay_per_step = 0.015
-                elif action_name in ("scroll_up", "scroll_down"):
-                    multiplier     = sensitivity_scroll
-                    delay_per_step = 0.005
-
-            if action_name.startswith("switch_profile_") or action_name == "next_profile":
-                action_func()
-            elif multiplier == 1:
-                action_func()
-            else:
-                for _ in range(multiplier):
-                    action_func()
-                    time.sleep(delay_per_step)
-
-        elif action_type == "macro":
-            keys_to_press = action_obj.get("keys", [])
-            keycodes = [KEYNAME_TO_KEYCODE[k] for k in keys_to_press if k in KEYNAME_TO_KEYCODE]
-            if keycodes:
-                try:
-                    kbd.press(*keycodes)
-                    time.sleep(0.01)
-                    kbd.release_all()
-                except Exception as e:
-                    print(f"[MACRO] {e}")
-                    kbd.release_all()
-
-        elif action_type == "macro_advanced":
-
-            steps = action_obj.get("steps", [])
-            if not steps:
-                print("[MACRO_ADV] 'steps' list is empty.")
-                return
+        for op, arg in steps:
+            if op == _STEP_PRESS:
+                kbd.press(*arg)
+            elif op == _STEP_RELEASE:
+                kbd.release(*arg)
+            elif op == _STEP_TAP:
+                kbd.press(*arg)
+                time.sleep(0.01)
+                kbd.release(*arg)
+            elif op == _STEP_WAIT:
+                time.sleep(arg)
+            elif op == _STEP_RELEASE_ALL:
+                kbd.release_all()
+            time.sleep(0.01)
+    except Exception as e:
+        log_error("MACRO_ADV", e)
+    finally:
+
+        try:
+            kbd.release_all()
+        except Exception:
+            pass
+
+
+def _compile_action(action_key, action_obj, where):
+    # -> (callable, repeat count, delay between repeats in seconds)
+    nothing     = SIMPLE_ACTIONS_MAP["nothing"]
+    action_type = action_obj.get("type", "simple")
+
+    if action_type == "simple":
+        action_name = action_obj.get("action", "nothing")
+        action_func = SIMPLE_ACTIONS_MAP.get(action_name, nothing)
+        if action_key in _ROTARY_KEYS:
+            if action_name in ("volume_up", "volume_down"):
+                # The volume slider runs 2..10; half that many reports per detent.
+                return (action_func, max(1, round(sensitivity_volume / 2)), VOLUME_STEP_DELAY)
+            if action_name in ("scroll_up", "scroll_down"):
+                return (action_func, sensitivity_scroll, SCROLL_STEP_DELAY)
+        return (action_func, 1, 0)
+
+    if action_type == "macro":
+        keycodes = _resolve_keycodes(action_obj.get("keys", []), where)
+        return (_make_macro(keycodes) if keycodes else nothing, 1, 0)
+
+    if action_type == "macro_advanced":
+        steps = _compile_steps(action_obj.get("steps", []), where)
+        return (lambda: _run_macro_advanced(steps), 1, 0)
+
+    return (nothing, 1, 0)
+
+
+def compile_profiles():
+    """
+    Resolve every profile's gestures into (callable, repeat, delay, key)
+    records, indexed like _ALL_GESTURE_KEYS. Done once after the config is loaded, so
+    an encoder tick costs one list index instead of several dict lookups and
+    string comparisons. Must be re-run if the sensitivities change.
+    """
+    compiled = []
+    for p_index, profile in enumerate(profiles_data["profiles"]):
+        row = []
+        for key in _ALL_GESTURE_KEYS:
             try:
-                for step in steps:
-                    if "press" in step:
-                        codes = [KEYNAME_TO_KEYCODE[k] for k in step["press"] if k in KEYNAME_TO_KEYCODE]
-                        if codes:
-                            kbd.press(*codes)
-                    elif "release" in step:
-                        codes = [KEYNAME_TO_KEYCODE[k] for k in step["release"] if k in KEYNAME_TO_KEYCODE]
-                        if codes:
-                            kbd.release(*codes)
-                    elif "tap" in step:
-                        codes = [KEYNAME_TO_KEYCODE[k] for k in step["tap"] if k in KEYNAME_TO_KEYCODE]
-                        if codes:
-                            kbd.press(*codes)
-                            time.sleep(0.01)
-                            kbd.release(*codes)
-                    elif "wait" in step:
-                        try:
-                            time.sleep(float(step["wait"]))
-                        except Exception:
-                            print(f"[MACRO_ADV] Invalid wait: {step['wait']}")
-                    elif step.get("release_all"):
-                        kbd.release_all()
-                    time.sleep(0.01)
+                where = f"Profile {p_index + 1} '{key}'"
+                row.append(_compile_action(key, profile.get(key, _NOOP_ACTION), where) + (key,))
             except Exception as e:
-                print(f"[MACRO_ADV] Error: {e}")
-            finally:
+                print(f"[CONFIG] Profile {p_index + 1} '{key}' unusable: {e}")
+                row.append((SIMPLE_ACTIONS_MAP["nothing"], 1, 0, key))
+        compiled.append(row)
+    return compiled
+
+
+# Gesture slots in a compiled profile row; the loop indexes by these instead
+# of hashing gesture names.
+_CW, _CCW   = GESTURE_INDEX["cw"], GESTURE_INDEX["ccw"]
+_SCW, _SCCW = GESTURE_INDEX["cw_shifted"], GESTURE_INDEX["ccw_shifted"]
+_CLICK      = GESTURE_INDEX["click"]
+_DOUBLE     = GESTURE_INDEX["double_click"]
+_TRIPLE     = GESTURE_INDEX["triple_click"]
+_LONG       = GESTURE_INDEX["long_press"]
+
 
-                try:
-                    kbd.release_all()
-                except Exception:
-                    pass
+def set_active_profile(index):
+    # Rotation entries are pre-paired so the loop can index them with
+    # (current_position > last_position): False -> ccw, True -> cw.
+    global active_profile, active_turn, active_shift_turn
+    active_profile    = compiled_profiles[index]
+    active_turn       = (active_profile[_CCW], active_profile[_CW])
+    active_shift_turn = (active_profile[_SCCW], active_profile[_SCW])
+
+
+def run_action(entry, steps=1):
+    # steps > 1 when several detents were turned since the last iteration.
+
+    action_func, repeat, delay, action_key = entry
+    try:
+        if repeat == 1 and steps == 1:
+            action_func()
+        else:
+            for _ in range(repeat * steps):
+                action_func()
+                if delay:
+                    time.sleep(delay)
 
     except Exception as e:
-        print(f"[ACTION] Error on '{action_key}': {e}")
-        traceback.print_exception(type(e), e, e.__traceback__)
+        log_error("ACTION", f"'{action_key}': {e}")
 
         try:
             kbd.release_all()
@@ -453,103 +603,157 @@ def execute_hid_action(action_key):
             pass
 
 
-# Main Loop
-
-print("--- Ready  Profile " + str(current_profile_index + 1) + " | Vol " + str(sensitivity_volume) + "x | Scroll " + str(sensitivity_scroll) + "x | Mouse " + str(sensitivity_mouse) + "x ---")
+compiled_profiles = compile_profiles()
+set_active_profile(current_profile_index)
 
-serial_port = usb_cdc.data
 
-while True:
-    current_time     = time.monotonic_ns()
-    current_position = encoder.position
-    _raw_pressed     = not button_sw.value
+# Main Loop
+# The loop runs inside main() so its state and the hot names bound below are
+# locals; CircuitPython resolves every global through a dict lookup.
 
-    if _raw_pressed == _btn_last_raw:
-        if _btn_stable_count < DEBOUNCE_COUNT:
-            _btn_stable_count += 1
-            if _btn_stable_count >= DEBOUNCE_COUNT:
-                button_debounced = _raw_pressed
-    else:
-        _btn_last_raw     = _raw_pressed
-        _btn_stable_count = 1
-    button_pressed = button_debounced
+print("--- Ready  Profile " + str(current_profile_index + 1) + " | Vol " + str(sensitivity_volume) + "x | Scroll " + str(sensitivity_scroll) + "x | Mouse " + str(sensitivity_mouse) + "x ---")
 
-    # Serial command check
-    if serial_port and serial_port.connected and serial_port.in_waiting > 0:
-        try:
-            raw = bytearray()
-            while serial_port.in_waiting > 0:
-                raw.extend(serial_port.read(serial_port.in_waiting))
-            command = raw.decode("utf-8").strip().upper() if raw else ""
-            if command == "REBOOT":
-                print("[SYSTEM] Rebooting...")
-                time.sleep(0.5)
-                microcontroller.reset()
-            elif command:
-                print(f"[SERIAL] Unknown command: {command}")
-        except Exception as e:
-            print(f"[SERIAL] {e}")
 
-    # Button & encoder state machine
-    try:
+def main():
+    monotonic_ns = time.monotonic_ns
+    sleep        = time.sleep
+    run          = run_action
+    _encoder     = encoder
+    _button      = button_sw
+    serial_port  = usb_cdc.data
+
+    last_position     = _encoder.position
+    # States: 0=Released  1=Pressed/awaiting  2=LongPress/awaiting release  3=Shifted
+    # Timers are stored as absolute monotonic_ns() deadlines. The timestamps
+    # exceed the small-int range, so each "now - start" would allocate a
+    # long int; comparing against a deadline does not.
+    button_state      = 0
+    long_press_at     = 0       # press time + LONG_PRESS_NS
+    click_count       = 0
+    multi_click_until = 0       # last release + MULTI_CLICK_TIMEOUT_NS
+    _btn_last_raw     = False   # last raw reading (pre-debounce)
+    _btn_settled_at   = 0       # last raw change + DEBOUNCE_NS
+    button_debounced  = False   # debounced state exposed to state machine
+    idle_counter      = 0
+    next_serial_poll  = 0
+    quiet_until       = 0       # last activity + PROFILE_SAVE_DELAY_NS
 
+    while True:
+        # One clock read per iteration, shared by the debounce window, serial
+        # throttle, multi-click timeout and long-press check. Integer ns, so
+        # no float is allocated.
+        current_time     = monotonic_ns()
+        current_position = _encoder.position
+        _raw_pressed     = not _button.value
+        _moved           = current_position != last_position
+
+        # Serial command check: one read of whatever is buffered, matched as
+        # bytes; nothing is ever decoded.
+        n = 0
+        if serial_port and current_time >= next_serial_poll:
+            next_serial_poll = current_time + SERIAL_POLL_NS
+            if serial_port.connected:
+                n = serial_port.in_waiting
+        if n:
+            if profile_save_pending:
+                quiet_until = current_time + PROFILE_SAVE_DELAY_NS
+            try:
+                data = serial_port.read(n).strip().upper()
+                if b"REBOOT" in data:
+                    print("[SYSTEM] Rebooting...")
+                    sleep(0.5)
+                    microcontroller.reset()
+                elif data:
+                    print("[SERIAL] Unknown command:", data)
+            except Exception as e:
+                log_error("SERIAL", e)
+
+        # Fast idle path: nothing turned, button up and settled, no gesture
+        # pending. The debounce and state machine would do nothing, so the
+        # iteration is just the serial check above and a growing sleep.
+        if not (_moved or _raw_pressed or _btn_last_raw or button_debounced
+                or button_state or click_count):
+            if profile_save_pending and current_time >= quiet_until:
+                flush_profile_save()
+            if idle_counter < IDLE_SLEEP_MAX_MS:
+                idle_counter += 1
+            sleep(0.001 * idle_counter)
+            continue
+        idle_counter = 0
+
+        if _raw_pressed != _btn_last_raw:
+            _btn_last_raw    = _raw_pressed
+            _btn_settled_at  = current_time + DEBOUNCE_NS
+        elif _raw_pressed != button_debounced and current_time >= _btn_settled_at:
+            button_debounced = _raw_pressed
+        button_pressed = button_debounced
+
+        # Button & encoder state machine
         if button_state == 0 and click_count > 0:
-            if (current_time - last_release_time) > MULTI_CLICK_TIMEOUT_NS:
+            if current_time > multi_click_until:
                 pending     = click_count
                 click_count = 0           # commit reset unconditionally first
                 if pending == 1:
-                    execute_hid_action("click")
+                    run(active_profile[_CLICK])
                 elif pending == 2:
-                    execute_hid_action("double_click")
+                    run(active_profile[_DOUBLE])
                 else:
-                    execute_hid_action("triple_click")
+                    run(active_profile[_TRIPLE])
 
         if button_state == 0:   # Released
             if button_pressed:
                 button_state      = 1
-                button_press_time = current_time
+                long_press_at     = current_time + LONG_PRESS_NS
             else:
                 if current_position != last_position:
 
                     if click_count == 0:
-                        execute_hid_action("cw" if current_position > last_position else "ccw")
+                        delta = current_position - last_position
+                        run(active_turn[delta > 0], abs(delta))
                     last_position = current_position   # always sync regardless of click_count
 
         elif button_state == 1:   # Pressed — awaiting action
             if not button_pressed:
                 button_state      = 0
                 click_count      += 1
-                last_release_time = current_time
+                multi_click_until = current_time + MULTI_CLICK_TIMEOUT_NS
 
                 if click_count >= 3:
                     click_count = 0
-                    execute_hid_action("triple_click")
-            else:
-                if current_position != last_position:
-                    direction     = "cw_shifted" if current_position > last_position else "ccw_shifted"
-                    last_position = current_position
-                    button_state  = 3
-                    click_count   = 0
-                    execute_hid_action(direction)
-                elif (current_time - button_press_time) >= LONG_PRESS_NS:
-                    button_state = 2
-                    click_count  = 0
-                    execute_hid_action("long_press")
+                    run(active_profile[_TRIPLE])
+            elif current_position != last_position:
+                # Turned while held: hand over to state 3 below, which
+                # sends this first shifted step in the same iteration.
+                button_state = 3
+                click_count  = 0
+            elif current_time >= long_press_at:
+                button_state = 2
+                click_count  = 0
+                run(active_profile[_LONG])
 
         elif button_state == 2:   # Long press done — wait for release
             if not button_pressed:
                 button_state = 0
 
-        elif button_state == 3:   # Shifted — continue shifted rotation until release
+        if button_state == 3:     # Shifted — continue shifted rotation until release
             if not button_pressed:
                 button_state = 0
             elif current_position != last_position:
-                execute_hid_action("cw_shifted" if current_position > last_position else "ccw_shifted")
+                delta = current_position - last_position
+                run(active_shift_turn[delta > 0], abs(delta))
                 last_position = current_position
 
-    except Exception as e:
-        print(f"[LOOP] {e}")
-        traceback.print_exception(type(e), e, e.__traceback__)
-        time.sleep(0.5)
+        if profile_save_pending:
+            quiet_until = current_time + PROFILE_SAVE_DELAY_NS
+        sleep(0.001)
+
 
-    time.sleep(0.01)
+# Actions catch their own errors, so anything reaching here is a real fault
+# (hardware or firmware bug): report it once and restart cleanly.
+try:
+    main()
+except Exception as e:
+    print(f"[LOOP] Fatal: {e}")
+    traceback.print_exception(type(e), e, e.__traceback__)
+    time.sleep(1)
+    microcontroller.reset()